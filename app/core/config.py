@@ -1,7 +1,21 @@
+from collections.abc import Callable
+import logging
 import os
+import sys
+import threading
+from typing import Any, Literal
 
+from dotenv import dotenv_values
+from pydantic import (
+    NonNegativeFloat, NonNegativeInt, PositiveFloat, PositiveInt,
+    ValidationError, model_validator,
+)
 from pydantic_settings import BaseSettings
 
+from .exceptions import ConfigError
+
+_LOGGER = logging.getLogger(__name__)
+
 
 def to_boolean(value: str) -> bool:
     if value.lower() in ["yes", "true", "y", "1"]:
@@ -10,19 +24,131 @@ def to_boolean(value: str) -> bool:
 
 
 class Settings(BaseSettings):
-    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_LEVEL: Literal[
+        "CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG", "NOTSET"
+    ] = os.getenv("LOG_LEVEL", "INFO")
     LOG_USE_BASIC_FORMAT: bool = to_boolean(
         os.getenv("LOG_USE_BASIC_FORMAT", "True")
     )
 
-    CONCURRENCY_LIMIT: int = int(os.getenv("CONCURRENCY_LIMIT", "10"))
-    MAX_QUEUE_SIZE: int = int(os.getenv("MAX_QUEUE_SIZE", "5"))
+    CONCURRENCY_LIMIT: PositiveInt = int(os.getenv("CONCURRENCY_LIMIT", "10"))
+    MAX_QUEUE_SIZE: PositiveInt = int(os.getenv("MAX_QUEUE_SIZE", "5"))
+    CONFIG_ENV_FILE: str = os.getenv("CONFIG_ENV_FILE", "")
+    ADMIN_TOKEN: str = os.getenv("ADMIN_TOKEN", "")
 
     CHATBOT_URL: str = os.getenv("CHATBOT_URL", "localhost")
-    CHATBOT_PORT: int = int(os.getenv("CHATBOT_PORT", "8000"))
+    CHATBOT_PORT: PositiveInt = int(os.getenv("CHATBOT_PORT", "8000"))
     CHATBOT_ENDPOINT: str = os.getenv("CHATBOT_ENDPOINT", "/api")
+    STREAM_MAX_RESUMES: NonNegativeInt = int(
+        os.getenv("STREAM_MAX_RESUMES", "3")
+    )
+    STREAM_RESUME_BACKOFF: NonNegativeFloat = float(
+        os.getenv("STREAM_RESUME_BACKOFF", "0.5")
+    )
+
+    HTTP_TIMEOUT: PositiveFloat = float(os.getenv("HTTP_TIMEOUT", "60"))
+    HTTP_RETRIES: NonNegativeInt = int(os.getenv("HTTP_RETRIES", "5"))
+    HTTP_POOL_SIZE: PositiveInt = int(os.getenv("HTTP_POOL_SIZE", "5"))
+    HTTP_POOL_DRAIN_TIMEOUT: PositiveFloat = float(
+        os.getenv("HTTP_POOL_DRAIN_TIMEOUT", "420")
+    )
+    HTTP_COMPRESSION: bool = to_boolean(os.getenv("HTTP_COMPRESSION", "True"))
+    HTTP_COMPRESSION_ENCODINGS: str = os.getenv(
+        "HTTP_COMPRESSION_ENCODINGS", "zstd, br, gzip"
+    )
+    STREAM_COMPRESSION: bool = to_boolean(
+        os.getenv("STREAM_COMPRESSION", "False")
+    )
 
     FAQ_ENDPOINT: str = os.getenv("FAQ_ENDPOINT", "/api/faq")
+    FAQ_PREFETCH_INTERVAL: PositiveInt = int(
+        os.getenv("FAQ_PREFETCH_INTERVAL", "3600")
+    )
+    FAQ_PREFETCH_PERIODS: NonNegativeInt = int(
+        os.getenv("FAQ_PREFETCH_PERIODS", "0")
+    )
+    FAQ_MAX_ITEMS: PositiveInt = int(os.getenv("FAQ_MAX_ITEMS", "30"))
     LOGO_PATH: str = os.getenv("LOGO_PATH", "app/assets/deloitte.png")
 
+    @model_validator(mode="after")
+    def check_pool_drain_timeout(self) -> "Settings":
+        """A replaced connection pool must outlive the requests using it."""
+        max_request_time = self.HTTP_TIMEOUT * (self.HTTP_RETRIES + 1)
+        if self.HTTP_POOL_DRAIN_TIMEOUT <= max_request_time:
+            raise ValueError(
+                "HTTP_POOL_DRAIN_TIMEOUT must be longer than "
+                f"HTTP_TIMEOUT * (HTTP_RETRIES + 1) = {max_request_time}s"
+            )
+        return self
+
+
 config = Settings()
+_listeners: list[Callable[[dict[str, Any]], None]] = []
+_reload_lock = threading.Lock()
+
+# app/main.py imports this module as ``app.core.config`` while the services
+# import it as ``core.config``. Share one instance so a reload reaches both.
+_alias = sys.modules.get(
+    "core.config" if __name__ == "app.core.config" else "app.core.config"
+)
+if _alias is not None and hasattr(_alias, "config"):
+    config = _alias.config
+    _listeners = _alias._listeners
+    _reload_lock = _alias._reload_lock
+
+
+def on_reload(callback: Callable[[dict[str, Any]], None]):
+    """Register a callback, called with the changed settings on reload."""
+    _listeners.append(callback)
+
+
+def reload_config(env_file: str | None = None) -> dict[str, Any]:
+    """Reload settings from the environment and apply them in place.
+
+    Args:
+        env_file (str, optional): Env file to load first. Its values override
+            the current environment.
+
+    Raises:
+        ConfigError: If the new settings are invalid. Nothing is applied.
+
+    Returns:
+        dict[str, Any]: The settings that changed, with their new values.
+    """
+    with _reload_lock:
+        environ = dict(os.environ)
+        if env_file:
+            if not os.path.isfile(env_file):
+                raise ConfigError(f"Env file not found: {env_file}")
+            environ.update({
+                key: value
+                for key, value in dotenv_values(env_file).items()
+                if value is not None
+            })
+        try:
+            new_config = Settings(
+                **{
+                    field: environ[field]
+                    for field in Settings.model_fields
+                    if field in environ
+                }
+            )
+        except ValidationError as exc:
+            raise ConfigError(f"Invalid settings: {exc}") from exc
+
+        changed = {
+            field: getattr(new_config, field)
+            for field in Settings.model_fields
+            if getattr(new_config, field) != getattr(config, field)
+        }
+        os.environ.update(environ)
+        for field, value in changed.items():
+            setattr(config, field, value)
+        _LOGGER.info("Reloaded settings, changed: %s", sorted(changed))
+
+        for callback in _listeners:
+            try:
+                callback(changed)
+            except Exception:
+                _LOGGER.exception("Failed to apply reloaded settings")
+        return changed
@@ -8,3 +8,7 @@ class ChatError(ServiceError):
 
 class FAQError(ServiceError):
     """Raised when there is an error in FAQ service."""
+
+
+class ConfigError(Exception):
+    """Raised when settings can't be loaded."""
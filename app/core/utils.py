@@ -1,16 +1,25 @@
+from functools import cache
 import logging
 import os
 
-from .config import config
+from .config import config, on_reload
 
 _LOGGER = logging.getLogger(__name__)
 
 
-def get_llm_params(platform: str = "vertexai"):
-    conf = dir(config)
+@cache
+def _llm_params(platform: str) -> dict:
+    conf = type(config).model_fields
     params = {
         c.split(platform.upper() + "_")[-1].lower(): getattr(config, c)
         for c in conf
         if platform in c.lower()
     }
     return params
+
+
+def get_llm_params(platform: str = "vertexai"):
+    return dict(_llm_params(platform))
+
+
+on_reload(lambda changed: _llm_params.cache_clear())
@@ -1,25 +1,26 @@
 import asyncio
+from functools import cache
+import hmac
 import logging
-from datetime import datetime
 from random import shuffle
+import signal
+import threading
 from time import time
 from uuid import uuid4
+import weakref
 
 import gradio as gr
 
-from app.core.config import config as c
+from app.core.config import config as c, on_reload, reload_config
+from app.core.exceptions import ConfigError
 from app.core.loggers import setup_logging
 from app.datamodel.chat import ChatQuery
 from app.datamodel.feedback import Feedback
 from app.datamodel.response import ResponseWithSources
-from app.services.chatbot import ChatbotService
-from app.services.faq import FAQService
 
-setup_logging(
-    log_level=c.LOG_LEVEL,
-    use_basic_format=c.LOG_USE_BASIC_FORMAT,
-)
 _LOGGER = logging.getLogger(__name__)
+# apps built by create_app, to apply reloaded settings to
+_APPS: weakref.WeakSet = weakref.WeakSet()
 
 css = """
 #logo {
@@ -50,14 +51,36 @@ button.secondary {
 """
     # background-color: #1c4e1f;
 
-chatbot = ChatbotService(
-    base_url=c.CHATBOT_URL,
-    port=c.CHATBOT_PORT
-)
-faq_service = FAQService(
-    base_url=c.CHATBOT_URL,
-    port=c.CHATBOT_PORT
-)
+LOADING_FAQ_HEADER = """
+    <h1 align="center">FAQ</h1>
+    <p align="center"><i>FAQ sedang dimuat...</i></p>
+    """
+
+
+@cache
+def get_chatbot_service():
+    """Services are imported and built on first use to keep boot fast."""
+    from app.services.chatbot import ChatbotService
+
+    return ChatbotService(
+        base_url=c.CHATBOT_URL,
+        port=c.CHATBOT_PORT
+    )
+
+
+@cache
+def get_faq_prefetcher():
+    from app.services.faq import FAQPrefetcher, FAQService
+
+    faq_service = FAQService(
+        base_url=c.CHATBOT_URL,
+        port=c.CHATBOT_PORT
+    )
+    return FAQPrefetcher(
+        faq_service,
+        interval=c.FAQ_PREFETCH_INTERVAL,
+        periods=c.FAQ_PREFETCH_PERIODS,
+    )
 
 
 def clear_history(request: gr.Request, sessions: gr.State):
@@ -90,7 +113,7 @@ def chat(
     _LOGGER.info("%s is chatting with session: %s (%s)",
                  user_id, request.session_hash,
                  sessions[request.session_hash]["interaction_id"])
-    response: ResponseWithSources = chatbot.chat(
+    response: ResponseWithSources = get_chatbot_service().chat(
         query=ChatQuery(
             query=message,
             user_id=user_id,
@@ -130,10 +153,12 @@ async def chat_with_llm(
                  user_id, request.session_hash,
                  sessions[request.session_hash]["interaction_id"])
 
+    from app.services.chatbot import StreamRestarted
+
     response_text = ""
     try:
         _LOGGER.info("Incoming stream response..")
-        async for chunk in chatbot.stream_gemini(
+        async for chunk in get_chatbot_service().stream_gemini(
             query=ChatQuery(
                 query=message,
                 session_id=sessions[request.session_hash]["interaction_id"],
@@ -142,7 +167,10 @@ async def chat_with_llm(
                 language=language,
             )
         ):
-            if isinstance(chunk, tuple):
+            if isinstance(chunk, StreamRestarted):
+                _LOGGER.warning("Stream restarted, discarding partial answer")
+                response_text = ""
+            elif isinstance(chunk, tuple):
                 session_id, message_id = chunk
                 sessions[request.session_hash][
                     "ai_response_id"
@@ -209,131 +237,310 @@ def send_feedback(
         gr.Info("Maaf untuk ketidaknyamanannya. "
                 "Terima kasih sudah memberikan penilaian.")
 
-    chatbot.send_feedback(data)
+    get_chatbot_service().send_feedback(data)
     _LOGGER.info("Done sending feedback")
     return feedback
 
 
-def refresh_qa():
-    t0 = time()
-    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    faq = faq_service.generate()
-    shuffle(faq.faq)
-    qa_containers = [
-        gr.Markdown(
-            f"""
-            <h1 align="center">FAQ</h1>
-            <p align="right"><i>Generated at: {now}</i></p>
-            """,
-            elem_id="md-title"
-        )
+def period_choices():
+    return [("Latest", "")] + [
+        (period, period)
+        for period in get_faq_prefetcher().available_periods
+        if period
     ]
-    for qa in faq.faq:
-        qa_containers.extend([
-            qa.question,
-            qa.answer,
-        ])
-    _LOGGER.info("Done refreshing FAQ in %.2fs", time() - t0)
+
+
+def render_faq(period: str = "", n_items: int = 0):
+    """Render a prefetched FAQ into the header and ``n_items`` QA slots.
+
+    Each slot is a question, the accordion holding its answer and the answer.
+    Slots without an item are hidden.
+    """
+    faq = get_faq_prefetcher().get(period or "")
+    if faq is None:
+        if period:
+            gr.Warning("FAQ untuk periode ini belum tersedia.")
+        header, items = LOADING_FAQ_HEADER, []
+    else:
+        header, items = faq.header, list(faq.items)
+        shuffle(items)
+        if len(items) > n_items:
+            _LOGGER.warning("Showing %d of %d FAQ items",
+                            n_items, len(items))
+
+    qa_containers = [header]
+    for idx in range(n_items):
+        if idx < len(items):
+            question, answer = items[idx]
+            qa_containers.extend([
+                gr.update(value=question, visible=True),
+                gr.update(visible=True),
+                answer,
+            ])
+        else:
+            qa_containers.extend([
+                gr.update(visible=False), gr.update(visible=False), "",
+            ])
     return qa_containers
 
 
-with gr.Blocks(title="CBRM", css=css) as demo:
-    state = gr.State({})
-    with gr.Tab("Chat"):
-        gr.Markdown(
-            """
-            <h1 align="center">Generative AI Chatbot</h1>
-            """
-        )
-        with gr.Row():
-            persona = gr.Dropdown(
-                ["Relationship Manager", "Resource Manager"],
-                label="Select persona",
-                value="Resource Manager",
-            )
-            language = gr.Textbox(
-                placeholder="Language of the response..",
-                label="Response language",
-            )
-            rm = gr.Dropdown(
-                ["USER003", "USER002", "USER001"],
-                label="Select User",
-                value="USER001",
-            )
+def refresh_qa(period: str, n_items: int):
+    t0 = time()
+    qa_containers = render_faq(period, n_items)
+    _LOGGER.info("Done refreshing FAQ in %.2fs", time() - t0)
+    return [gr.update(choices=period_choices())] + qa_containers
 
-        bot = gr.Chatbot(height=400)
-        chat = gr.ChatInterface(
-            chat_with_llm,
-            chatbot=bot,
-            theme="soft",
-            submit_btn="Send",
-            show_progress="minimal",
-            additional_inputs=[state, persona, rm, language],
-        )
 
-        # Add change handlers to clear conversation
-        persona.change(
-            clear_history,
-            inputs=[state],
-            outputs=[chat.chatbot, chat.chatbot_state],
-        )
-        language.change(
-            clear_history,
-            inputs=[state],
-            outputs=[chat.chatbot, chat.chatbot_state],
-        )
-        rm.change(
-            clear_history,
-            inputs=[state],
-            outputs=[chat.chatbot, chat.chatbot_state],
-        )
+def resize_queue(demo: gr.Blocks) -> bool:
+    """Apply the queue settings to the running queue.
+
+    gradio has no public API for this, so it relies on the internals of the
+    pinned gradio version.
+
+    Returns:
+        bool: False if those internals are missing and nothing was changed.
+    """
+    queue = getattr(demo, "_queue", None)
+    event_queues = getattr(queue, "event_queue_per_concurrency_id", None)
+    fns = getattr(demo, "fns", None)
+    if (
+        not isinstance(event_queues, dict) or not isinstance(fns, dict)
+        or not hasattr(queue, "max_size")
+        or not hasattr(queue, "default_concurrency_limit")
+    ):
+        return False
+
+    default_fns = [
+        fn for fn in fns.values()
+        if getattr(fn, "concurrency_limit", None) == "default"
+    ]
+    if not all(hasattr(fn, "concurrency_id") for fn in default_fns) or not all(
+        hasattr(event_queue, "concurrency_limit")
+        for event_queue in event_queues.values()
+    ):
+        return False
+
+    queue.max_size = c.MAX_QUEUE_SIZE
+    queue.default_concurrency_limit = c.CONCURRENCY_LIMIT
+    for fn in default_fns:
+        event_queue = event_queues.get(fn.concurrency_id)
+        if event_queue is not None:
+            event_queue.concurrency_limit = c.CONCURRENCY_LIMIT
+    return True
+
 
-        # handlers to clear conversation whenever either persona, language, or
-        # rm change values
+def apply_settings(changed: dict, apps=None):
+    """Apply reloaded settings to the services and the running apps.
 
-        clear_btn = gr.ClearButton(
-            value="Clear Conversation",
+    Args:
+        changed (dict): The settings that changed.
+        apps (Iterable[gr.Blocks], optional): Apps to resize the queue of.
+            Defaults to every app built by ``create_app``.
+    """
+    if "LOG_LEVEL" in changed:
+        logging.getLogger().setLevel(c.LOG_LEVEL)
+
+    if {"CONCURRENCY_LIMIT", "MAX_QUEUE_SIZE"} & changed.keys():
+        for demo in list(_APPS if apps is None else apps):
+            if not resize_queue(demo):
+                _LOGGER.warning(
+                    "Can't resize the running gradio queue, restart to "
+                    "apply CONCURRENCY_LIMIT and MAX_QUEUE_SIZE"
+                )
+
+    if any(
+        key in ("CHATBOT_URL", "CHATBOT_PORT") or key.startswith("HTTP_")
+        for key in changed
+    ):
+        get_chatbot_service().reconfigure(c.CHATBOT_URL, c.CHATBOT_PORT)
+        get_faq_prefetcher().service.reconfigure(
+            c.CHATBOT_URL, c.CHATBOT_PORT
         )
-        clear_btn.click(
-            clear_history,
-            inputs=[state],
-            outputs=[chat.chatbot, chat.chatbot_state],
+
+    # a new backend serves different FAQs, so refresh right away as well
+    if {
+        "CHATBOT_URL", "CHATBOT_PORT",
+        "FAQ_PREFETCH_INTERVAL", "FAQ_PREFETCH_PERIODS",
+    } & changed.keys():
+        get_faq_prefetcher().reconfigure(
+            c.FAQ_PREFETCH_INTERVAL, c.FAQ_PREFETCH_PERIODS
         )
 
-        bot.like(send_feedback, inputs=[chat.chatbot, rm, state])
 
-    with gr.Tab("FAQ"):
-        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        faq = faq_service.generate()
+def reload_settings(token: str):
+    """Admin endpoint to reload the settings."""
+    if not c.ADMIN_TOKEN or not hmac.compare_digest(
+        token or "", c.ADMIN_TOKEN
+    ):
+        raise gr.Error("Invalid admin token")
+    try:
+        changed = reload_config(c.CONFIG_ENV_FILE or None)
+    except ConfigError as exc:
+        raise gr.Error(str(exc)) from exc
+    return sorted(changed)
 
-        header_md = gr.Markdown(
-            f"""
-            <h1 align="center">FAQ</h1>
-            <p align="right"><i>Generated at: {now}</i></p>
-            """
-        )
 
-        with gr.Row():
-            refresh_btn = gr.Button("Refresh FAQ", scale=0)
+def handle_sighup(signum, frame):
+    try:
+        reload_config(c.CONFIG_ENV_FILE or None)
+    except ConfigError:
+        _LOGGER.exception("Failed to reload settings")
 
 
-        qa_containers = [header_md]
-        for qa in faq.faq:
-            question_md = gr.Markdown(f"**{qa.question}**")
-            with gr.Accordion("Lihat jawaban", open=False):
-                answer_md = gr.Markdown(qa.answer)
-            qa_containers.extend([question_md, answer_md])
+@cache
+def register_reload_listener():
+    """Register ``apply_settings`` for reloads, once per process."""
+    on_reload(apply_settings)
 
-        refresh_btn.click(
-            fn=refresh_qa,
-            outputs=qa_containers,
-        )
 
+def create_app(prefetch: bool = True) -> gr.Blocks:
+    """Build the Gradio app.
+
+    Logging, services and the UI are set up here rather than at import time,
+    so importing this module stays cheap.
+
+    Args:
+        prefetch (bool, optional): Start the FAQ prefetcher. Defaults to True.
+    """
+    t0 = time()
+    setup_logging(
+        log_level=c.LOG_LEVEL,
+        use_basic_format=c.LOG_USE_BASIC_FORMAT,
+    )
+    if prefetch:
+        get_faq_prefetcher().start()
+
+    with gr.Blocks(title="CBRM", css=css) as demo:
+        state = gr.State({})
+        with gr.Tab("Chat"):
+            gr.Markdown(
+                """
+                <h1 align="center">Generative AI Chatbot</h1>
+                """
+            )
+            with gr.Row():
+                persona = gr.Dropdown(
+                    ["Relationship Manager", "Resource Manager"],
+                    label="Select persona",
+                    value="Resource Manager",
+                )
+                language = gr.Textbox(
+                    placeholder="Language of the response..",
+                    label="Response language",
+                )
+                rm = gr.Dropdown(
+                    ["USER003", "USER002", "USER001"],
+                    label="Select User",
+                    value="USER001",
+                )
+
+            bot = gr.Chatbot(height=400)
+            chat = gr.ChatInterface(
+                chat_with_llm,
+                chatbot=bot,
+                theme="soft",
+                submit_btn="Send",
+                show_progress="minimal",
+                additional_inputs=[state, persona, rm, language],
+            )
+
+            # Add change handlers to clear conversation
+            persona.change(
+                clear_history,
+                inputs=[state],
+                outputs=[chat.chatbot, chat.chatbot_state],
+            )
+            language.change(
+                clear_history,
+                inputs=[state],
+                outputs=[chat.chatbot, chat.chatbot_state],
+            )
+            rm.change(
+                clear_history,
+                inputs=[state],
+                outputs=[chat.chatbot, chat.chatbot_state],
+            )
+
+            # handlers to clear conversation whenever either persona, language,
+            # or rm change values
+
+            clear_btn = gr.ClearButton(
+                value="Clear Conversation",
+            )
+            clear_btn.click(
+                clear_history,
+                inputs=[state],
+                outputs=[chat.chatbot, chat.chatbot_state],
+            )
+
+            bot.like(send_feedback, inputs=[chat.chatbot, rm, state])
+
+        with gr.Tab("FAQ"):
+            n_items = c.FAQ_MAX_ITEMS
+            header_md = gr.Markdown(LOADING_FAQ_HEADER)
+
+            with gr.Row():
+                period_dd = gr.Dropdown(
+                    period_choices(),
+                    label="Select period",
+                    value="",
+                )
+                refresh_btn = gr.Button("Refresh FAQ", scale=0)
+
+            qa_containers = [header_md]
+            for _ in range(n_items):
+                question_md = gr.Markdown(visible=False)
+                with gr.Accordion(
+                    "Lihat jawaban", open=False, visible=False
+                ) as answer_accordion:
+                    answer_md = gr.Markdown()
+                qa_containers.extend([question_md, answer_accordion, answer_md])
+
+            period_dd.change(
+                fn=lambda period: render_faq(period, n_items),
+                inputs=[period_dd],
+                outputs=qa_containers,
+            )
+            refresh_btn.click(
+                fn=lambda period: refresh_qa(period, n_items),
+                inputs=[period_dd],
+                outputs=[period_dd] + qa_containers,
+            )
+            demo.load(
+                fn=lambda: refresh_qa("", n_items),
+                outputs=[period_dd] + qa_containers,
+            )
+
+        if c.ADMIN_TOKEN:
+            admin_token = gr.Textbox(visible=False)
+            admin_result = gr.JSON(visible=False)
+            gr.Button(visible=False).click(
+                reload_settings,
+                inputs=[admin_token],
+                outputs=[admin_result],
+                api_name="reload_config",
+                # the queue may be full when its limits need changing
+                queue=False,
+            )
 
-if __name__ == "__main__":
-    _LOGGER.info("Starting UI")
     demo.queue(
         default_concurrency_limit=c.CONCURRENCY_LIMIT,
         max_size=c.MAX_QUEUE_SIZE
     )
+    _APPS.add(demo)
+    register_reload_listener()
+    # signal handlers can only be installed from the main thread
+    if (
+        hasattr(signal, "SIGHUP")
+        and threading.current_thread() is threading.main_thread()
+    ):
+        signal.signal(signal.SIGHUP, handle_sighup)
+    _LOGGER.info("Done building app in %.2fs (excluding imports)",
+                 time() - t0)
+    return demo
+
+
+if __name__ == "__main__":
+    demo = create_app()
+    _LOGGER.info("Starting UI")
     demo.launch()
@@ -1,11 +1,42 @@
 """Base service module."""
 from dataclasses import dataclass
 from http import HTTPStatus
+import logging
+import threading
 
 import requests
 from requests import RequestException
 from requests.adapters import HTTPAdapter
 from urllib3 import Retry
+from urllib3.util import make_headers
+
+from core.config import config as c
+
+_LOGGER = logging.getLogger(__name__)
+
+def accept_encoding(encodings: str, supported: list[str]) -> str:
+    """Build an Accept-Encoding header value.
+
+    Args:
+        encodings (str): Comma separated content-codings, in preference order.
+        supported (list[str]): Content-codings the HTTP client can decode.
+
+    Returns:
+        str: The codings from ``encodings`` that are supported, or
+            "identity" if there is none.
+    """
+    supported = {encoding.strip().lower() for encoding in supported}
+    available = [
+        encoding
+        for encoding in (e.strip().lower() for e in encodings.split(","))
+        if encoding in supported
+    ]
+    return ", ".join(available) or "identity"
+
+
+def requests_encodings() -> list[str]:
+    """Content-codings the installed urllib3 can decode."""
+    return make_headers(accept_encoding=True)["accept-encoding"].split(",")
 
 
 @dataclass
@@ -14,8 +45,13 @@ class BaseService:
     port: int
 
     def __post_init__(self):
-        if "http" not in self.base_url:
-            self.base_url = "http://" + self.base_url
+        self.base_url = self._with_scheme(self.base_url)
+
+    @staticmethod
+    def _with_scheme(base_url: str) -> str:
+        if "http" not in base_url:
+            return "http://" + base_url
+        return base_url
 
     @property
     def session(self):
@@ -24,24 +60,53 @@ class BaseService:
             requests.Session
         """
         if not hasattr(self, "_session"):
-            session = requests.Session()
-            retries = Retry(
-                total=5,
-                backoff_factor=0.1,
-                status_forcelist=[
-                    HTTPStatus.REQUEST_TIMEOUT,
-                    HTTPStatus.INTERNAL_SERVER_ERROR,
-                    HTTPStatus.BAD_GATEWAY,
-                    HTTPStatus.SERVICE_UNAVAILABLE,
-                    HTTPStatus.GATEWAY_TIMEOUT,
-                ],
+            setattr(self, "_session", self._build_session())
+        return getattr(self, "_session")
+
+    def _build_session(self) -> requests.Session:
+        session = requests.Session()
+        session.headers["Accept-Encoding"] = (
+            accept_encoding(
+                c.HTTP_COMPRESSION_ENCODINGS, requests_encodings()
             )
-            adapter = HTTPAdapter(
-                max_retries=retries,
-                pool_connections=5,
-                pool_maxsize=5,
+            if c.HTTP_COMPRESSION else "identity"
+        )
+        retries = Retry(
+            total=c.HTTP_RETRIES,
+            backoff_factor=0.1,
+            status_forcelist=[
+                HTTPStatus.REQUEST_TIMEOUT,
+                HTTPStatus.INTERNAL_SERVER_ERROR,
+                HTTPStatus.BAD_GATEWAY,
+                HTTPStatus.SERVICE_UNAVAILABLE,
+                HTTPStatus.GATEWAY_TIMEOUT,
+            ],
+        )
+        adapter = HTTPAdapter(
+            max_retries=retries,
+            pool_connections=c.HTTP_POOL_SIZE,
+            pool_maxsize=c.HTTP_POOL_SIZE,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def reconfigure(self, base_url: str, port: int):
+        """Point the service to ``base_url`` and renew the connection pool
+        from the current settings.
+
+        The old pool is closed after ``HTTP_POOL_DRAIN_TIMEOUT`` seconds, so
+        requests already using it can finish.
+        """
+        self.base_url = self._with_scheme(base_url)
+        self.port = port
+        old_session = getattr(self, "_session", None)
+        setattr(self, "_session", self._build_session())
+        if old_session is not None:
+            timer = threading.Timer(
+                c.HTTP_POOL_DRAIN_TIMEOUT, old_session.close
             )
-            session.mount("http://", adapter)
-            session.mount("https://", adapter)
-            setattr(self, "_session", session)
-        return getattr(self, "_session")
+            timer.daemon = True
+            timer.start()
+        _LOGGER.info("%s now uses %s:%s", type(self).__name__,
+                     self.base_url, self.port)
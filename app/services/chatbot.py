@@ -1,31 +1,55 @@
+import asyncio
+from collections import Counter
 from collections.abc import AsyncGenerator
+from dataclasses import dataclass
 import json
 import logging
 import sys
+from uuid import uuid4
 
-import aiohttp
 from requests import RequestException
 
-from core.config import config as c
+from core.config import config as c, to_boolean
 from core.exceptions import ChatError
 from datamodel.chat import ChatQuery
 from datamodel.feedback import Feedback
 from datamodel.response import ResponseWithSources
-from services.base import BaseService
+from services.base import BaseService, accept_encoding
 
 _LOGGER = logging.getLogger(__name__)
 
 
+@dataclass
+class StreamCursor:
+    """Position in a chat stream, used to resume it after a drop."""
+    message_id: str | None = None
+    offset: int = 0
+
+
+class StreamRestarted:
+    """Yielded when a dropped stream could not be resumed and the answer is
+    regenerated from scratch."""
+
+
+def aiohttp_encodings() -> list[str]:
+    """Content-codings the installed aiohttp can decode."""
+    from aiohttp.compression_utils import HAS_BROTLI
+
+    return ["gzip", "deflate"] + (["br"] if HAS_BROTLI else [])
+
+
 class ChatbotService(BaseService):
     """Chatbot service."""
     def __init__(self, base_url: str, port: int):
         super().__init__(base_url, port)
+        self.stream_stats = Counter(resumed=0, restarted=0)
 
     def chat(self, query: ChatQuery) -> ResponseWithSources:
         try:
             response = self.session.post(
                 f"{self.base_url}:{self.port}{c.CHATBOT_ENDPOINT}/chat",
                 json=query.model_dump(),
+                timeout=c.HTTP_TIMEOUT,
             )
             if response.status_code != 200:
                 _LOGGER.exception("Got status code %s", response.status_code)
@@ -40,6 +64,7 @@ class ChatbotService(BaseService):
             response = self.session.post(
                 f"{self.base_url}:{self.port}{c.CHATBOT_ENDPOINT}/reset_session",
                 params={"session_id": session_id},
+                timeout=c.HTTP_TIMEOUT,
             )
             if response.status_code != 200:
                 _LOGGER.exception("Got status code %s", response.status_code)
@@ -53,6 +78,7 @@ class ChatbotService(BaseService):
                 f"{self.base_url}:{self.port}{c.CHATBOT_ENDPOINT}"
                 "/feedback/send",
                 json=feedback.model_dump(),
+                timeout=c.HTTP_TIMEOUT,
             )
             if response.status_code != 200:
                 _LOGGER.exception("Got status code %s", response.status_code)
@@ -66,28 +92,113 @@ class ChatbotService(BaseService):
     async def stream_gemini(
         self,
         query: ChatQuery
-    ) -> AsyncGenerator[str | tuple[str, str], None]:
+    ) -> AsyncGenerator[str | tuple[str, str] | StreamRestarted, None]:
         """
         Calls the given Gemini model with the given text content,
         streaming output as an async generator.
+
+        If the connection drops mid-answer, the stream is reopened with the
+        last received ``message_id`` and line offset as cursor. A backend that
+        supports resuming answers with ``X-Stream-Resumed: true`` and
+        continues after the cursor. Otherwise the answer is regenerated once,
+        in which case ``StreamRestarted`` is yielded first so the caller can
+        discard the partial answer.
         """
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{self.base_url}:{self.port}{c.CHATBOT_ENDPOINT}/chat/stream",
-                headers={
+        import aiohttp  # deferred: only needed once the first stream starts
+
+        cursor = StreamCursor()
+        idempotency_key = str(uuid4())
+        resumes = restarts = 0
+        can_resume = True
+        # no total limit, so long answers aren't cut off, but a stalled
+        # connection raises TimeoutError and is resumed
+        timeout = aiohttp.ClientTimeout(total=None, sock_read=c.HTTP_TIMEOUT)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            while True:
+                headers = {
                     "content-type": "application/json",
-                    "Accept": "text/event-stream"
-                },
-                json=query.model_dump(),
-            ) as response:
-                if response.status != 200:
-                    yield f"Error: Status {response.status}"
-                    return
-
-                async for chunk in self.stream_response_chunks(response):
-                    yield chunk
-
-    async def stream_response_chunks(self, response):
+                    "Accept": "text/event-stream",
+                    "Idempotency-Key": idempotency_key,
+                    "Accept-Encoding": (
+                        accept_encoding(
+                            c.HTTP_COMPRESSION_ENCODINGS, aiohttp_encodings()
+                        )
+                        if c.STREAM_COMPRESSION else "identity"
+                    ),
+                }
+                reconnecting = resumes + restarts > 0
+                if reconnecting and cursor.message_id:
+                    headers["Last-Event-ID"] = cursor.message_id
+                    headers["X-Stream-Offset"] = str(cursor.offset)
+                try:
+                    async with session.post(
+                        f"{self.base_url}:{self.port}{c.CHATBOT_ENDPOINT}"
+                        "/chat/stream",
+                        headers=headers,
+                        json=query.model_dump(),
+                    ) as response:
+                        if response.status != 200:
+                            if reconnecting:
+                                raise ChatError(
+                                    f"Failed to reconnect stream: "
+                                    f"status {response.status}"
+                                )
+                            yield f"Error: Status {response.status}"
+                            return
+
+                        if reconnecting:
+                            resumed = to_boolean(
+                                response.headers.get("X-Stream-Resumed", "")
+                            )
+                            self.stream_stats[
+                                "resumed" if resumed else "restarted"
+                            ] += 1
+                            _LOGGER.info("Stream %s (%s)",
+                                         "resumed" if resumed else "restarted",
+                                         dict(self.stream_stats))
+                            if not resumed:
+                                # the backend regenerated the answer, which
+                                # uses up the single retry
+                                can_resume = False
+                                restarts = 1
+                                cursor = StreamCursor()
+                                yield StreamRestarted()
+
+                        async for chunk in self.stream_response_chunks(
+                            response, cursor
+                        ):
+                            yield chunk
+                        return
+                except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                    if (
+                        can_resume and cursor.message_id
+                        and resumes < c.STREAM_MAX_RESUMES
+                    ):
+                        resumes += 1
+                    elif restarts < 1:
+                        restarts += 1
+                        cursor.message_id = None
+                    else:
+                        raise
+                    backoff = c.STREAM_RESUME_BACKOFF * 2 ** (
+                        resumes + restarts - 1
+                    )
+                    _LOGGER.warning(
+                        "Stream dropped after %d lines (%s), "
+                        "reconnecting in %.2fs",
+                        cursor.offset, exc, backoff
+                    )
+                    await asyncio.sleep(backoff)
+
+    async def stream_response_chunks(
+        self, response, cursor: StreamCursor | None = None
+    ):
+        """Yield the chunks of a streaming response.
+
+        ``cursor`` is updated with the ``message_id`` and the number of lines
+        received, so an interrupted stream can be resumed from there.
+        """
+        cursor = cursor or StreamCursor()
         previous_response = ""
         first_chunk = True
 
@@ -97,6 +208,10 @@ class ChatbotService(BaseService):
                 try:
                     # Parse the JSON from the response
                     data = json.loads(decoded_chunk)
+                    cursor.offset += 1
+                    cursor.message_id = (
+                        data.get('message_id') or cursor.message_id
+                    )
                     # Get the current response
                     current_response = data.get('response', '')
                     if not current_response:
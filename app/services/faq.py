@@ -1,4 +1,7 @@
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
 import logging
+import threading
 
 from requests import RequestException
 
@@ -31,13 +34,132 @@ class FAQService(BaseService):
             response = self.session.get(
                 f"{self.base_url}:{self.port}"
                 f"{c.CHATBOT_ENDPOINT}{c.FAQ_ENDPOINT}",
-                params=payload.model_dump()
+                params=payload.model_dump(),
+                timeout=c.HTTP_TIMEOUT,
             )
             if response.status_code != 200:
                 _LOGGER.exception("Got status code %s", response.status_code)
                 response.raise_for_status()
             _LOGGER.info("Got %d FAQs", response.json()["total_item"])
+            _LOGGER.debug("FAQ payload: %s bytes on wire (%s), %d decoded",
+                          response.headers.get("Content-Length", "?"),
+                          response.headers.get("Content-Encoding", "identity"),
+                          len(response.content))
         except RequestException as exc:
             raise FAQError("Error when generating FAQ") from exc
 
         return FAQ.model_validate(response.json())
+
+
+@dataclass(frozen=True)
+class RenderedFAQ:
+    """FAQ of a single period, already rendered to markdown."""
+    period: str
+    generated_at: str
+    header: str
+    items: tuple[tuple[str, str], ...]
+
+
+class FAQPrefetcher:
+    """Prefetch and pre-render FAQs in a background thread.
+
+    The latest FAQ (period "") and, optionally, the previous ``periods`` days
+    are fetched every ``interval`` seconds. Each refresh builds a new cache
+    and swaps it in at once, so readers never see a partially updated cache.
+    A period that fails to fetch or validate keeps its previous version.
+    """
+    def __init__(
+        self, service: FAQService, interval: int = 3600, periods: int = 0
+    ):
+        self.service = service
+        self.interval = interval
+        self.periods = periods
+        self._cache: dict[str, RenderedFAQ] = {}
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def periods_to_fetch(self) -> list[str]:
+        """Latest period first, followed by the previous days."""
+        today = date.today()
+        return [""] + [
+            (today - timedelta(days=i)).isoformat()
+            for i in range(1, self.periods + 1)
+        ]
+
+    @property
+    def available_periods(self) -> list[str]:
+        return list(self._cache)
+
+    def get(self, period: str = "") -> RenderedFAQ | None:
+        return self._cache.get(period)
+
+    def refresh(self):
+        """Fetch every period and swap the cache."""
+        cache = dict(self._cache)
+        for period in self.periods_to_fetch:
+            try:
+                cache[period] = self.render(period, self.service.generate(period))
+            except (FAQError, ValueError) as exc:
+                _LOGGER.warning(
+                    "Failed to prefetch FAQ for period %r: %s",
+                    period or "latest", exc
+                )
+        expected = set(self.periods_to_fetch)
+        self._cache = {p: faq for p, faq in cache.items() if p in expected}
+        _LOGGER.info("FAQ cache refreshed with %d periods", len(self._cache))
+
+    @staticmethod
+    def render(period: str, faq: FAQ) -> RenderedFAQ:
+        """Validate and render the FAQ to markdown.
+
+        Raises:
+            ValueError: If the FAQ has no items.
+        """
+        if not faq.faq:
+            raise ValueError("FAQ is empty")
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        header = f"""
+            <h1 align="center">FAQ</h1>
+            <p align="right"><i>Generated at: {now}</i></p>
+            """
+        items = tuple(
+            (f"**{qa.question}**", qa.answer) for qa in faq.faq
+        )
+        return RenderedFAQ(
+            period=period, generated_at=now, header=header, items=items
+        )
+
+    def start(self):
+        """Start refreshing in the background, beginning right away."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._wake.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="faq-prefetcher", daemon=True
+        )
+        self._thread.start()
+
+    def reconfigure(self, interval: int, periods: int):
+        """Apply a new schedule and refresh right away."""
+        self.interval = interval
+        self.periods = periods
+        self._wake.set()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception:  # keep the scheduler alive
+                _LOGGER.exception("Failed to refresh FAQ cache")
+            self._wake.wait(self.interval)
+            self._wake.clear()
@@ -0,0 +1,175 @@
+"""Compression benchmark.
+
+Measures bytes on wire and CPU time of each content-coding for a FAQ
+payload and for a ``/chat/stream`` response compressed per line.
+
+Usage:
+    python benchmarks/compression.py [--faq-file PATH] [--items N]
+"""
+import argparse
+import json
+from random import Random
+from time import perf_counter
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+WORDS = (
+    "nasabah rekening kredit tabungan bunga pinjaman cabang layanan produk "
+    "deposito transaksi limit tagihan pembayaran investasi asuransi"
+).split()
+
+
+def sample_faq(n_items: int) -> bytes:
+    rng = Random(0)
+    items = [
+        {
+            "topic": rng.choice(WORDS),
+            "question": " ".join(rng.choices(WORDS, k=12)) + "?",
+            "answer": " ".join(rng.choices(WORDS, k=120)) + ".",
+        }
+        for _ in range(n_items)
+    ]
+    return json.dumps({"faq": items, "total_item": n_items}).encode()
+
+
+def sample_stream(n_words: int = 300) -> list[bytes]:
+    """Lines of a cumulative stream, each resending the text so far."""
+    rng = Random(0)
+    lines = []
+    text = ""
+    for i in range(n_words):
+        text += rng.choice(WORDS) + " "
+        lines.append(json.dumps({
+            "response": text, "is_complete": i == n_words - 1,
+            "session_id": "session", "message_id": "message",
+        }).encode() + b"\n")
+    return lines
+
+
+def codecs() -> dict:
+    """content-coding -> (compress, decompress, stream compressor factory,
+    stream decompressor factory).
+
+    Stream compressors flush after every line, as the backend has to for the
+    client to see each line as soon as it is sent.
+    """
+    result = {
+        "identity": (
+            _identity, _identity, lambda: _identity, lambda: _identity,
+        ),
+        "gzip": (
+            lambda data: zlib.compress(data, wbits=31),
+            lambda data: zlib.decompress(data, wbits=31),
+            lambda: _flushing(zlib.compressobj(wbits=31), zlib.Z_SYNC_FLUSH),
+            lambda: zlib.decompressobj(wbits=31).decompress,
+        ),
+    }
+    if brotli is not None:
+        result["br"] = (
+            brotli.compress, brotli.decompress,
+            lambda: _BrotliLines(brotli.Compressor()),
+            lambda: brotli.Decompressor().process,
+        )
+    if zstandard is not None:
+        result["zstd"] = (
+            zstandard.ZstdCompressor().compress,
+            zstandard.ZstdDecompressor().decompress,
+            lambda: _flushing(
+                zstandard.ZstdCompressor().compressobj(),
+                zstandard.COMPRESSOBJ_FLUSH_BLOCK,
+            ),
+            lambda: zstandard.ZstdDecompressor().decompressobj().decompress,
+        )
+    return result
+
+
+def _identity(data):
+    return data
+
+
+def _flushing(compressobj, mode):
+    return lambda line: compressobj.compress(line) + compressobj.flush(mode)
+
+
+class _BrotliLines:
+    def __init__(self, compressor):
+        self.compressor = compressor
+
+    def __call__(self, line):
+        return self.compressor.process(line) + self.compressor.flush()
+
+
+def timed(func, *args, repeat: int = 20):
+    t0 = perf_counter()
+    for _ in range(repeat):
+        result = func(*args)
+    return result, (perf_counter() - t0) / repeat * 1000
+
+
+def timed_stream(
+    compressor_factory, decompressor_factory, lines: list[bytes],
+    repeat: int = 5,
+) -> tuple[int, float, float]:
+    """Compress and decompress ``lines`` one at a time.
+
+    Returns:
+        tuple[int, float, float]: Bytes on wire, compression and
+            decompression time in ms. Creating the (de)compressors is not
+            timed.
+    """
+    comp_ms = decomp_ms = 0.0
+    for _ in range(repeat):
+        compress_line = compressor_factory()
+        t0 = perf_counter()
+        chunks = [compress_line(line) for line in lines]
+        comp_ms += (perf_counter() - t0) * 1000
+
+        decompress_chunk = decompressor_factory()
+        t0 = perf_counter()
+        decoded = [decompress_chunk(chunk) for chunk in chunks]
+        decomp_ms += (perf_counter() - t0) * 1000
+        assert decoded == lines, "stream did not round-trip line by line"
+    return sum(len(chunk) for chunk in chunks), \
+        comp_ms / repeat, decomp_ms / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--faq-file", help="FAQ JSON saved from the backend")
+    parser.add_argument("--items", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.faq_file:
+        with open(args.faq_file, "rb") as f:
+            faq = f.read()
+    else:
+        faq = sample_faq(args.items)
+    lines = sample_stream()
+    raw_stream = sum(len(line) for line in lines)
+
+    print(f"{'coding':<9} {'payload':<7} {'bytes':>9} {'ratio':>6} "
+          f"{'comp ms':>8} {'decomp ms':>9}")
+    for name, (compress, decompress, stream_compressor,
+               stream_decompressor) in codecs().items():
+        body, comp_ms = timed(compress, faq)
+        _, decomp_ms = timed(decompress, body)
+        print(f"{name:<9} {'faq':<7} {len(body):>9} "
+              f"{len(body) / len(faq):>6.2f} {comp_ms:>8.2f} {decomp_ms:>9.2f}")
+
+        size, comp_ms, decomp_ms = timed_stream(
+            stream_compressor, stream_decompressor, lines
+        )
+        print(f"{name:<9} {'stream':<7} {size:>9} "
+              f"{size / raw_stream:>6.2f} {comp_ms:>8.2f} {decomp_ms:>9.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Startup benchmark.
+
+Builds the app in a fresh interpreter with ``-X importtime``, writes the
+slowest imports to a report and fails when the total startup time, imports
+included, is above ``--target`` (or the ``STARTUP_TIME_TARGET`` environment
+variable) seconds. The FAQ prefetcher is not started, so the result does not
+depend on the backend.
+
+Usage:
+    PYTHONPATH=.:app python benchmarks/startup.py [--report PATH] [--top N]
+"""
+import argparse
+import os
+import subprocess
+import sys
+from time import time
+
+SNIPPET = "from app.main import create_app; create_app(prefetch=False)"
+
+
+def parse_importtime(stderr: str) -> list[tuple[int, int, str]]:
+    """Parse ``-X importtime`` output into (self_us, cumulative_us, module)."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), module.rstrip()))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--report", default="benchmarks/importtime.txt")
+    parser.add_argument("--top", type=int, default=30)
+    parser.add_argument(
+        "--target", type=float,
+        default=float(os.getenv("STARTUP_TIME_TARGET", "5.0")),
+    )
+    args = parser.parse_args()
+
+    t0 = time()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", SNIPPET],
+        capture_output=True, text=True, check=False,
+    )
+    elapsed = time() - t0
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr)
+        sys.exit(proc.returncode)
+
+    rows = sorted(parse_importtime(proc.stderr), key=lambda r: -r[1])
+    with open(args.report, "w", encoding="utf-8") as f:
+        f.write(f"python {sys.version.split()[0]}, "
+                f"startup: {elapsed:.2f}s (target {args.target:.2f}s)\n")
+        f.write(f"{'self [us]':>10} | {'cumulative':>10} | module\n")
+        for self_us, cumulative_us, module in rows[:args.top]:
+            f.write(f"{self_us:>10} | {cumulative_us:>10} | {module}\n")
+
+    print(f"Startup took {elapsed:.2f}s (target {args.target:.2f}s), "
+          f"report written to {args.report}")
+    if elapsed > args.target:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
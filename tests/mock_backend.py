@@ -0,0 +1,60 @@
+"""Mock chatbot backend for ``/chat/stream`` that drops connections."""
+import asyncio
+import json
+
+from aiohttp import web
+
+ANSWER = ["Halo", ", ", "ada yang ", "bisa ", "dibantu?"]
+MESSAGE_ID = "message-1"
+REQUESTS = web.AppKey("requests", list)
+
+
+def create_mock_backend(
+    resumable: bool, drops: int = 1, drop_after: int = 2,
+    endpoint: str = "/api", stall: float = 0,
+) -> web.Application:
+    """Create the mock backend app.
+
+    Args:
+        resumable (bool): Continue after the ``X-Stream-Offset`` cursor when
+            ``Last-Event-ID`` is sent. Otherwise every request regenerates
+            the answer from the start.
+        drops (int): Number of requests whose connection is dropped.
+        drop_after (int): Lines sent before the connection is dropped.
+        endpoint (str): Chatbot endpoint prefix.
+        stall (float): If set, dropped requests stop sending for this many
+            seconds instead of closing the connection.
+
+    The headers of every request are recorded in ``app[REQUESTS]``.
+    """
+    requests = []
+
+    async def chat_stream(request: web.Request) -> web.StreamResponse:
+        requests.append(request.headers.copy())
+        resume = resumable and "Last-Event-ID" in request.headers
+        start = int(request.headers["X-Stream-Offset"]) if resume else 0
+
+        response = web.StreamResponse(
+            headers={"X-Stream-Resumed": "true"} if resume else {}
+        )
+        await response.prepare(request)
+        for idx in range(start, len(ANSWER)):
+            if len(requests) <= drops and idx == start + drop_after:
+                if stall:
+                    await asyncio.sleep(stall)
+                else:
+                    request.transport.close()
+                return response
+            await response.write(json.dumps({
+                "response": ANSWER[idx],
+                "is_complete": idx == len(ANSWER) - 1,
+                "session_id": "session-1",
+                "message_id": MESSAGE_ID,
+            }).encode() + b"\n")
+        await response.write_eof()
+        return response
+
+    app = web.Application()
+    app[REQUESTS] = requests
+    app.router.add_post(f"{endpoint}/chat/stream", chat_stream)
+    return app
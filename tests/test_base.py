@@ -0,0 +1,51 @@
+from urllib3.util import make_headers
+
+from core.config import config as c
+from services import base
+from services.base import BaseService, accept_encoding
+
+
+def test_accept_encoding_keeps_preference_order():
+    assert accept_encoding("zstd, br, gzip", ["gzip", "br", "zstd"]) == (
+        "zstd, br, gzip"
+    )
+
+
+def test_accept_encoding_drops_unsupported_codings():
+    assert accept_encoding("zstd, br, gzip", ["gzip", "deflate"]) == "gzip"
+    assert accept_encoding("zstd", ["gzip"]) == "identity"
+
+
+def test_session_advertises_only_what_urllib3_decodes():
+    session = BaseService("localhost", 8000).session
+
+    advertised = session.headers["Accept-Encoding"].split(", ")
+    decodable = make_headers(accept_encoding=True)["accept-encoding"]
+    assert set(advertised) <= set(decodable.split(","))
+
+
+def test_session_without_zstd_decoder(monkeypatch):
+    monkeypatch.setattr(base, "requests_encodings", lambda: ["gzip", "deflate"])
+    monkeypatch.setattr(c, "HTTP_COMPRESSION_ENCODINGS", "zstd, br, gzip")
+
+    session = BaseService("localhost", 8000).session
+
+    assert session.headers["Accept-Encoding"] == "gzip"
+
+
+def test_session_without_compression(monkeypatch):
+    monkeypatch.setattr(c, "HTTP_COMPRESSION", False)
+
+    session = BaseService("localhost", 8000).session
+
+    assert session.headers["Accept-Encoding"] == "identity"
+
+
+def test_reconfigure_adds_scheme(monkeypatch):
+    monkeypatch.setattr(c, "HTTP_POOL_DRAIN_TIMEOUT", 0)
+    service = BaseService("localhost", 8000)
+
+    service.reconfigure("backend", 9000)
+
+    assert service.base_url == "http://backend"
+    assert service.port == 9000
@@ -0,0 +1,110 @@
+import asyncio
+from time import time
+
+from aiohttp import ClientError
+from aiohttp.test_utils import TestServer
+import pytest
+
+from core.config import config as c
+from datamodel.chat import ChatQuery
+from services.chatbot import (
+    ChatbotService, StreamRestarted, aiohttp_encodings
+)
+from tests.mock_backend import (
+    ANSWER, MESSAGE_ID, REQUESTS, create_mock_backend
+)
+
+QUERY = ChatQuery(query="halo", session_id="session-1", persona="persona")
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(c, "STREAM_RESUME_BACKOFF", 0)
+    monkeypatch.setattr(c, "CHATBOT_ENDPOINT", "/api")
+
+
+async def stream(app) -> tuple[ChatbotService, str]:
+    """Stream an answer from ``app`` the way the chat UI assembles it."""
+    async with TestServer(app) as server:
+        service = ChatbotService(f"http://{server.host}", server.port)
+        text = ""
+        async for chunk in service.stream_gemini(QUERY):
+            if isinstance(chunk, StreamRestarted):
+                text = ""
+            elif isinstance(chunk, str):
+                text += chunk
+    return service, text
+
+
+def test_stream_without_drop():
+    app = create_mock_backend(resumable=True, drops=0)
+    service, text = asyncio.run(stream(app))
+
+    assert text == "".join(ANSWER)
+    assert len(app[REQUESTS]) == 1
+    assert service.stream_stats == {"resumed": 0, "restarted": 0}
+
+
+def test_stream_resumes_from_cursor():
+    app = create_mock_backend(resumable=True, drop_after=2)
+    service, text = asyncio.run(stream(app))
+
+    assert text == "".join(ANSWER)
+    assert service.stream_stats == {"resumed": 1, "restarted": 0}
+    first, resumed = app[REQUESTS]
+    assert "Last-Event-ID" not in first
+    assert resumed["Last-Event-ID"] == MESSAGE_ID
+    assert resumed["X-Stream-Offset"] == "2"
+    assert resumed["Idempotency-Key"] == first["Idempotency-Key"]
+
+
+def test_stream_resumes_multiple_drops():
+    app = create_mock_backend(resumable=True, drops=2, drop_after=1)
+    service, text = asyncio.run(stream(app))
+
+    assert text == "".join(ANSWER)
+    assert service.stream_stats == {"resumed": 2, "restarted": 0}
+    assert [r.get("X-Stream-Offset") for r in app[REQUESTS]] == [
+        None, "1", "2"
+    ]
+
+
+def test_stream_resumes_after_stall(monkeypatch):
+    monkeypatch.setattr(c, "HTTP_TIMEOUT", 0.2)
+    app = create_mock_backend(resumable=True, drop_after=2, stall=10)
+    t0 = time()
+    service, text = asyncio.run(stream(app))
+
+    assert time() - t0 < 5
+    assert text == "".join(ANSWER)
+    assert service.stream_stats == {"resumed": 1, "restarted": 0}
+    assert app[REQUESTS][1]["X-Stream-Offset"] == "2"
+
+
+def test_stream_restarts_when_backend_cannot_resume():
+    app = create_mock_backend(resumable=False, drop_after=3)
+    service, text = asyncio.run(stream(app))
+
+    assert text == "".join(ANSWER)
+    assert service.stream_stats == {"resumed": 0, "restarted": 1}
+    assert len(app[REQUESTS]) == 2
+
+
+def test_stream_restarts_only_once():
+    app = create_mock_backend(resumable=False, drops=2)
+
+    with pytest.raises(ClientError):
+        asyncio.run(stream(app))
+    assert len(app[REQUESTS]) == 2
+
+
+def test_stream_compression_advertises_aiohttp_codings(monkeypatch):
+    monkeypatch.setattr(c, "STREAM_COMPRESSION", True)
+    monkeypatch.setattr(c, "HTTP_COMPRESSION_ENCODINGS", "zstd, br, gzip")
+    app = create_mock_backend(resumable=True, drops=0)
+    _, text = asyncio.run(stream(app))
+
+    advertised = app[REQUESTS][0]["Accept-Encoding"].split(", ")
+    assert text == "".join(ANSWER)
+    assert "zstd" not in advertised
+    assert set(advertised) <= set(aiohttp_encodings())
@@ -0,0 +1,69 @@
+import os
+
+import pytest
+
+from core import config as config_module
+from core.config import config as c, on_reload, reload_config
+from core.exceptions import ConfigError
+
+
+@pytest.fixture(autouse=True)
+def restore_config():
+    settings = c.model_dump()
+    environ = os.environ.copy()
+    listeners = list(config_module._listeners)
+    yield
+    for field, value in settings.items():
+        setattr(c, field, value)
+    os.environ.clear()
+    os.environ.update(environ)
+    config_module._listeners[:] = listeners
+
+
+def write_env(tmp_path, content: str) -> str:
+    env_file = tmp_path / "reload.env"
+    env_file.write_text(content)
+    return str(env_file)
+
+
+def test_reload_config_applies_env_file(tmp_path):
+    calls = []
+    on_reload(calls.append)
+    env_file = write_env(
+        tmp_path,
+        f"CONCURRENCY_LIMIT={c.CONCURRENCY_LIMIT + 1}\n"
+        f"CHATBOT_URL={c.CHATBOT_URL}\n",
+    )
+
+    changed = reload_config(env_file)
+
+    assert changed == {"CONCURRENCY_LIMIT": c.CONCURRENCY_LIMIT}
+    assert calls == [changed]
+
+
+def test_reload_config_env_file_overrides_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv("MAX_QUEUE_SIZE", "3")
+    env_file = write_env(tmp_path, "MAX_QUEUE_SIZE=7\n")
+
+    reload_config(env_file)
+
+    assert c.MAX_QUEUE_SIZE == 7
+
+
+@pytest.mark.parametrize("content", [
+    "CONCURRENCY_LIMIT=0\n",
+    "CHATBOT_PORT=not-a-port\n",
+    "LOG_LEVEL=VERBOSE\n",
+    "HTTP_TIMEOUT=60\nHTTP_RETRIES=5\nHTTP_POOL_DRAIN_TIMEOUT=300\n",
+])
+def test_reload_config_rejects_invalid_settings(tmp_path, content):
+    before = c.model_dump()
+
+    with pytest.raises(ConfigError):
+        reload_config(write_env(tmp_path, content))
+    assert c.model_dump() == before
+
+
+def test_reload_config_missing_env_file(tmp_path):
+    with pytest.raises(ConfigError):
+        reload_config(str(tmp_path / "missing.env"))
@@ -0,0 +1,120 @@
+from datetime import date, timedelta
+import threading
+
+import pytest
+
+from core.exceptions import FAQError
+from datamodel.faq import FAQ, FAQItem
+from services.faq import FAQPrefetcher
+
+YESTERDAY = (date.today() - timedelta(days=1)).isoformat()
+
+
+def make_faq(*questions: str) -> FAQ:
+    return FAQ(
+        faq=[
+            FAQItem(topic="topic", question=question, answer=f"{question}!")
+            for question in questions
+        ],
+        total_item=len(questions),
+    )
+
+
+class StubFAQService:
+    """Serve FAQs from ``faqs``; a period mapped to an exception raises it."""
+    def __init__(self, faqs: dict):
+        self.faqs = faqs
+        self.calls = []
+        self.called = threading.Event()
+
+    def generate(self, period: str = "") -> FAQ:
+        self.calls.append(period)
+        self.called.set()
+        faq = self.faqs[period]
+        if isinstance(faq, Exception):
+            raise faq
+        return faq
+
+
+def test_refresh_renders_every_period():
+    service = StubFAQService({"": make_faq("a", "b"), YESTERDAY: make_faq("c")})
+    prefetcher = FAQPrefetcher(service, periods=1)
+
+    prefetcher.refresh()
+
+    assert prefetcher.available_periods == ["", YESTERDAY]
+    assert prefetcher.get("").items == (("**a**", "a!"), ("**b**", "b!"))
+    assert prefetcher.get(YESTERDAY).items == (("**c**", "c!"),)
+
+
+@pytest.mark.parametrize("failure", [
+    FAQError("backend down"), make_faq(),
+], ids=["error", "empty"])
+def test_refresh_keeps_previous_version_on_failure(failure):
+    service = StubFAQService({"": make_faq("a")})
+    prefetcher = FAQPrefetcher(service)
+    prefetcher.refresh()
+    previous = prefetcher.get("")
+
+    service.faqs[""] = failure
+    prefetcher.refresh()
+
+    assert prefetcher.get("") is previous
+
+
+def test_refresh_prunes_expired_periods():
+    service = StubFAQService({"": make_faq("a"), YESTERDAY: make_faq("b")})
+    prefetcher = FAQPrefetcher(service, periods=1)
+    prefetcher.refresh()
+
+    prefetcher.periods = 0
+    prefetcher.refresh()
+
+    assert prefetcher.available_periods == [""]
+
+
+def test_reconfigure_wakes_thread():
+    service = StubFAQService({"": make_faq("a"), YESTERDAY: make_faq("b")})
+    prefetcher = FAQPrefetcher(service, interval=3600)
+    prefetcher.start()
+    try:
+        assert service.called.wait(5)
+        service.called.clear()
+
+        prefetcher.reconfigure(interval=3600, periods=1)
+
+        assert service.called.wait(5)
+        assert YESTERDAY in service.calls
+    finally:
+        prefetcher.stop()
+
+
+def test_render_faq_hides_unused_slots(monkeypatch):
+    from app import main
+
+    prefetcher = FAQPrefetcher(StubFAQService({"": make_faq("a")}))
+    prefetcher.refresh()
+    monkeypatch.setattr(main, "get_faq_prefetcher", lambda: prefetcher)
+
+    header, *slots = main.render_faq("", n_items=3)
+
+    assert header == prefetcher.get("").header
+    question, accordion, answer = slots[:3]
+    assert question["value"] == "**a**" and question["visible"]
+    assert accordion["visible"] and answer == "a!"
+    for idx in range(1, 3):
+        question, accordion, answer = slots[3 * idx:3 * idx + 3]
+        assert not question["visible"] and not accordion["visible"]
+        assert answer == ""
+
+
+def test_render_faq_shows_loading_before_first_refresh(monkeypatch):
+    from app import main
+
+    prefetcher = FAQPrefetcher(StubFAQService({}))
+    monkeypatch.setattr(main, "get_faq_prefetcher", lambda: prefetcher)
+
+    header, *slots = main.render_faq("", n_items=2)
+
+    assert header == main.LOADING_FAQ_HEADER
+    assert all(not slot["visible"] for slot in slots[0::3])
@@ -0,0 +1,140 @@
+import logging
+import threading
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from fastapi.testclient import TestClient
+import gradio as gr
+import pytest
+
+from app import main
+from app.core import config as config_module
+from app.core.config import config as c
+
+
+@pytest.fixture
+def demo():
+    with gr.Blocks() as blocks:
+        button = gr.Button()
+        button.click(lambda: None)
+        button.click(lambda: None, concurrency_limit=2)
+    blocks.queue(default_concurrency_limit=1, max_size=1)
+    # gradio creates the event queues when the first event is pushed
+    for fn in blocks.fns.values():
+        blocks._queue.create_event_queue_for_fn(fn)
+    return blocks
+
+
+def concurrency_limits(blocks):
+    return [
+        blocks._queue.event_queue_per_concurrency_id[
+            fn.concurrency_id
+        ].concurrency_limit
+        for fn in blocks.fns.values()
+    ]
+
+
+def test_apply_settings_resizes_queue(demo, monkeypatch):
+    monkeypatch.setattr(c, "CONCURRENCY_LIMIT", 4)
+    monkeypatch.setattr(c, "MAX_QUEUE_SIZE", 8)
+
+    main.apply_settings(
+        {"CONCURRENCY_LIMIT": 4, "MAX_QUEUE_SIZE": 8}, apps=[demo]
+    )
+
+    assert demo._queue.max_size == 8
+    assert demo._queue.default_concurrency_limit == 4
+    assert concurrency_limits(demo) == [4, 2]
+
+
+def test_apply_settings_warns_without_queue_internals(caplog):
+    with caplog.at_level(logging.WARNING):
+        main.apply_settings({"MAX_QUEUE_SIZE": 8}, apps=[SimpleNamespace()])
+
+    assert "restart" in caplog.text
+
+
+@pytest.mark.parametrize("admin_token, token", [
+    ("", ""),
+    ("", "anything"),
+    ("secret", ""),
+    ("secret", "wrong"),
+])
+def test_reload_settings_rejects_token(monkeypatch, admin_token, token):
+    monkeypatch.setattr(c, "ADMIN_TOKEN", admin_token)
+    monkeypatch.setattr(main, "reload_config", pytest.fail)
+
+    with pytest.raises(gr.Error):
+        main.reload_settings(token)
+
+
+def test_reload_settings(monkeypatch):
+    monkeypatch.setattr(c, "ADMIN_TOKEN", "secret")
+    monkeypatch.setattr(
+        main, "reload_config", lambda env_file: {"MAX_QUEUE_SIZE": 8}
+    )
+
+    assert main.reload_settings("secret") == ["MAX_QUEUE_SIZE"]
+
+
+def test_apply_settings_refreshes_faq_on_new_backend(monkeypatch):
+    chatbot, prefetcher = Mock(), Mock()
+    monkeypatch.setattr(main, "get_chatbot_service", lambda: chatbot)
+    monkeypatch.setattr(main, "get_faq_prefetcher", lambda: prefetcher)
+
+    main.apply_settings({"CHATBOT_URL": "backend"}, apps=[])
+
+    chatbot.reconfigure.assert_called_once_with(c.CHATBOT_URL, c.CHATBOT_PORT)
+    prefetcher.service.reconfigure.assert_called_once_with(
+        c.CHATBOT_URL, c.CHATBOT_PORT
+    )
+    prefetcher.reconfigure.assert_called_once_with(
+        c.FAQ_PREFETCH_INTERVAL, c.FAQ_PREFETCH_PERIODS
+    )
+
+
+def test_create_app_registers_reload_listener_once():
+    main.create_app(prefetch=False)
+    main.create_app(prefetch=False)
+
+    assert config_module._listeners.count(main.apply_settings) == 1
+
+
+def test_create_app_from_another_thread():
+    errors = []
+
+    def build():
+        try:
+            main.create_app(prefetch=False)
+        except Exception as exc:  # pylint: disable=broad-except
+            errors.append(exc)
+
+    thread = threading.Thread(target=build)
+    thread.start()
+    thread.join()
+
+    assert not errors
+
+
+def test_reload_endpoint_bypasses_full_queue(monkeypatch):
+    monkeypatch.setattr(c, "ADMIN_TOKEN", "secret")
+    monkeypatch.setattr(
+        main, "reload_config", lambda env_file: {"MAX_QUEUE_SIZE": 8}
+    )
+    demo = main.create_app(prefetch=False)
+    demo._queue.max_size = 0  # every queued event is rejected
+    # clients only join the queue for dependencies the config marks as queued
+    (dependency,) = [
+        dep
+        for dep in demo.get_config_file()["dependencies"]
+        if dep["api_name"] == "reload_config"
+    ]
+    assert dependency["queue"] is False
+
+    with TestClient(gr.routes.App.create_app(demo)) as client:
+        response = client.post(
+            "/gradio_api/run/reload_config", json={"data": ["secret"]}
+        )
+
+    assert response.status_code == 200
+    assert response.json()["data"] == [["MAX_QUEUE_SIZE"]]
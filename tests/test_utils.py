@@ -0,0 +1,9 @@
+from core.utils import get_llm_params
+
+
+def test_get_llm_params_returns_a_copy():
+    params = get_llm_params("chatbot")
+    params["injected"] = True
+
+    assert "injected" not in get_llm_params("chatbot")
+    assert get_llm_params("chatbot")["port"] == params["port"]